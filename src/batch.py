@@ -0,0 +1,19 @@
+from fastapi import HTTPException
+
+MAX_BATCH_SIZE = 50
+
+def parse_id_list(ids: str) -> list[int]:
+    """
+    Parse a comma separated list of IDs, dropping duplicates but keeping the request order.
+    """
+    try:
+        parsed = [int(value) for value in ids.split(",") if value.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="IDs must be a comma separated list of integers.")
+
+    unique_ids = list(dict.fromkeys(parsed))
+    if not unique_ids:
+        raise HTTPException(status_code=400, detail="At least one ID is required.")
+    if len(unique_ids) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"You can request up to {MAX_BATCH_SIZE} IDs at once.")
+    return unique_ids
@@ -1,21 +1,90 @@
 import os
+import time
+from itertools import count
 from dotenv import load_dotenv
-from sqlalchemy import create_engine, text
+from fastapi import Request
+from sqlalchemy import create_engine, make_url, text
+from sqlalchemy.exc import DBAPIError, OperationalError, ProgrammingError
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 
 load_dotenv()
 
 DATABASE_NAME = os.getenv("DB_DATABASE")
 DATABASE_URL = f"mysql+pymysql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/"
-FULL_DATABASE_URL = f"{DATABASE_URL}{DATABASE_NAME}"
+PRIMARY_URL_OVERRIDE = os.getenv("DB_PRIMARY_URL")
+FULL_DATABASE_URL = PRIMARY_URL_OVERRIDE or f"{DATABASE_URL}{DATABASE_NAME}"
+REPLICA_URLS = [url.strip() for url in os.getenv("DB_REPLICA_URLS", "").split(",") if url.strip()]
+REPLICA_RETRY_SECONDS = float(os.getenv("DB_REPLICA_RETRY_SECONDS", "30"))
+REPLICA_CONNECT_TIMEOUT = int(os.getenv("DB_REPLICA_CONNECT_TIMEOUT", "2"))
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("DB_REPLICA_MAX_LAG_SECONDS", "10"))
+REPLICA_LAG_CHECK_SECONDS = float(os.getenv("DB_REPLICA_LAG_CHECK_SECONDS", "5"))
+READ_AFTER_WRITE_SECONDS = float(os.getenv("DB_READ_AFTER_WRITE_SECONDS", "5"))
+PRIMARY_READ_POOL_SIZE = int(os.getenv("DB_PRIMARY_READ_POOL_SIZE", "5"))
+READ_PIN_COOKIE = "db_read_pin"
+READ_PIN_HEADER = "X-DB-Read-Pin"
 
 engine = create_engine(DATABASE_URL)
 db_engine = create_engine(FULL_DATABASE_URL)
+# Reads that land on the primary (pinned clients, replica failover) get a small
+# autocommit pool. Without replicas they simply share the db_engine pool.
+read_engine = (
+    create_engine(
+        FULL_DATABASE_URL, isolation_level="AUTOCOMMIT", pool_size=PRIMARY_READ_POOL_SIZE, max_overflow=0
+    )
+    if REPLICA_URLS
+    else db_engine
+)
+
+def create_replica_engine(url: str):
+    """
+    Create an autocommit engine for a replica. MySQL replicas get a short connect
+    timeout so an unreachable replica fails over to the primary quickly.
+    """
+    connect_args = {}
+    if make_url(url).get_backend_name() == "mysql":
+        connect_args["connect_timeout"] = REPLICA_CONNECT_TIMEOUT
+    return create_engine(url, pool_pre_ping=True, isolation_level="AUTOCOMMIT", connect_args=connect_args)
+
+replica_engines = [create_replica_engine(url) for url in REPLICA_URLS]
 
 Base = declarative_base()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=db_engine)
 
+_isolation_engines = {}
+_replica_down_until = [0.0] * len(replica_engines)
+_replica_lag_checked_until = [0.0] * len(replica_engines)
+_replica_turn = count()
+
+def mark_replica_down(index: int, seconds: float = REPLICA_RETRY_SECONDS):
+    """
+    Stop routing reads to a replica for the given number of seconds.
+    """
+    _replica_down_until[index] = time.time() + seconds
+
+class ReadSession(Session):
+    """
+    Read-only session. When a query on a replica fails with an OperationalError,
+    the replica is marked down and the query is retried once on the primary.
+    """
+    replica_index = None
+
+    def execute(self, *args, **kwargs):
+        try:
+            return super().execute(*args, **kwargs)
+        except OperationalError:
+            if self.replica_index is None:
+                raise
+            mark_replica_down(self.replica_index)
+            failed_connection = self.bind
+            self.close()
+            failed_connection.close()
+            self.bind = read_engine.connect()
+            self.replica_index = None
+            return super().execute(*args, **kwargs)
+
+ReadSessionLocal = sessionmaker(class_=ReadSession, autoflush=False, expire_on_commit=False)
+
 def get_db():
     db = SessionLocal()
     try:
@@ -23,10 +92,151 @@ def get_db():
     finally:
         db.close()
 
+def is_pinned_to_primary(request: Request) -> bool:
+    """
+    Check whether the client wrote recently and must read its own writes from the primary.
+    The pin comes from the X-DB-Read-Pin header (for frontends on other sites) or the
+    db_read_pin cookie. Both are set by the client, so pins further ahead than
+    READ_AFTER_WRITE_SECONDS are ignored.
+    """
+    now = time.time()
+    for value in (request.headers.get(READ_PIN_HEADER), request.cookies.get(READ_PIN_COOKIE)):
+        try:
+            pinned_until = float(value)
+        except (TypeError, ValueError):
+            continue
+        if now < pinned_until <= now + READ_AFTER_WRITE_SECONDS:
+            return True
+    return False
+
+def replica_lag_seconds(connection):
+    """
+    Return how many seconds a MySQL replica is behind its source, or None when
+    replication is stopped. Servers that are not replicas, and non-MySQL
+    databases, report 0.
+    """
+    if connection.dialect.name != "mysql":
+        return 0
+    try:
+        status = connection.exec_driver_sql("SHOW REPLICA STATUS").mappings().first()
+    except ProgrammingError:
+        status = connection.exec_driver_sql("SHOW SLAVE STATUS").mappings().first()
+    if status is None:
+        return 0
+    if "Seconds_Behind_Source" in status:
+        return status["Seconds_Behind_Source"]
+    return status["Seconds_Behind_Master"]
+
+def is_replica_fresh(index: int, connection) -> bool:
+    """
+    Check the replica's lag at most every REPLICA_LAG_CHECK_SECONDS. A replica that
+    is stopped or more than REPLICA_MAX_LAG_SECONDS behind is skipped until the next check.
+    """
+    if _replica_lag_checked_until[index] > time.time():
+        return True
+
+    lag = replica_lag_seconds(connection)
+    if lag is None or lag > REPLICA_MAX_LAG_SECONDS:
+        mark_replica_down(index, REPLICA_LAG_CHECK_SECONDS)
+        return False
+    _replica_lag_checked_until[index] = time.time() + REPLICA_LAG_CHECK_SECONDS
+    return True
+
+def open_read_connection(request: Request):
+    """
+    Open a connection for a read and return it with the index of the replica it
+    belongs to (None for the primary). With replicas configured the read engines
+    are created in autocommit mode, so connections stay in that mode instead of
+    being switched on every checkout.
+    Healthy replicas are tried in round-robin order; a replica that fails to connect
+    is skipped for REPLICA_RETRY_SECONDS. Falls back to the primary when no replica
+    is usable or the client is pinned after a write.
+    """
+    if replica_engines and not is_pinned_to_primary(request):
+        start = next(_replica_turn)
+        for offset in range(len(replica_engines)):
+            index = (start + offset) % len(replica_engines)
+            if _replica_down_until[index] > time.time():
+                continue
+            try:
+                connection = replica_engines[index].connect()
+            except DBAPIError:
+                mark_replica_down(index)
+                continue
+            try:
+                if is_replica_fresh(index, connection):
+                    return connection, index
+            except DBAPIError:
+                mark_replica_down(index)
+            connection.close()
+
+    return read_engine.connect(), None
+
+def get_read_db(request: Request):
+    """
+    Session for GET routes. It reads from a replica when one is configured and
+    is never flushed or committed.
+    """
+    connection, replica_index = open_read_connection(request)
+    db = ReadSessionLocal(bind=connection)
+    db.replica_index = replica_index
+    try:
+        yield db
+    finally:
+        db.close()
+        db.bind.close()
+
+async def pin_reads_after_write(request: Request, call_next):
+    """
+    Middleware that pins a client's reads to the primary for READ_AFTER_WRITE_SECONDS
+    after a successful write, so it does not read stale data from a lagging replica.
+    The pin is sent both as a cookie and as the X-DB-Read-Pin header; browsers do not
+    send the cookie cross-site, so frontends on other sites echo the header instead.
+    """
+    response = await call_next(request)
+    if replica_engines and request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400:
+        pinned_until = str(time.time() + READ_AFTER_WRITE_SECONDS)
+        response.set_cookie(
+            READ_PIN_COOKIE,
+            pinned_until,
+            max_age=max(1, round(READ_AFTER_WRITE_SECONDS)),
+            httponly=True,
+        )
+        response.headers[READ_PIN_HEADER] = pinned_until
+    return response
+
+def get_db_with_isolation(isolation_level: str):
+    """
+    Build a get_db style dependency whose sessions run at the given isolation level,
+    e.g. Depends(get_db_with_isolation("SERIALIZABLE")).
+    Each level gets its own engine, so the level is set once per new connection
+    rather than on every checkout and return. Those engines keep at most 5
+    connections each on top of the db_engine pool.
+    """
+    if isolation_level not in _isolation_engines:
+        _isolation_engines[isolation_level] = create_engine(
+            FULL_DATABASE_URL, isolation_level=isolation_level, pool_size=2, max_overflow=3
+        )
+    bind = _isolation_engines[isolation_level]
+
+    def dependency():
+        db = SessionLocal(bind=bind)
+        try:
+            yield db
+        finally:
+            db.close()
+
+    return dependency
+
 def initialize_database():
     """
     Create the database (if it doesn't exist) and run the SQL script.
+    Skipped when DB_PRIMARY_URL is set, since the script targets the server from the DB_* settings.
     """
+    if PRIMARY_URL_OVERRIDE:
+        print("DB_PRIMARY_URL is set, skipping database initialization.")
+        return
+
     try:
         with engine.connect() as connection:
             connection.execute(text(f"CREATE DATABASE IF NOT EXISTS `{DATABASE_NAME}`"))
@@ -5,17 +5,20 @@ from src.routers.bannerimage import image_router
 from src.routers.otp import otp_router
 from src.routers.blog import blog_router
 from src.routers.reel import reel_router
-from src.db import initialize_database
+from src.db import initialize_database, pin_reads_after_write, READ_PIN_HEADER
 from fastapi.middleware.cors import CORSMiddleware
 
 app = FastAPI()
 
+app.middleware("http")(pin_reads_after_write)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[READ_PIN_HEADER],
 )
 
 app.include_router(user_router, prefix="/user", tags=["Users"])
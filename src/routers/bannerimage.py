@@ -3,7 +3,7 @@ from base64 import b64encode
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from typing import List
-from src.db import get_db
+from src.db import get_db, get_read_db, get_db_with_isolation
 from src.models.bannerimage import ImageModel
 
 image_router = APIRouter()
@@ -31,10 +31,12 @@ def find_lowest_available_id(db: Session) -> int:
 @image_router.post("/upload-image")
 async def upload_image(
     file: UploadFile = File(...), 
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db_with_isolation("SERIALIZABLE"))
 ):
     """
     Upload a single image to the database using the lowest available ID.
+    Runs as SERIALIZABLE so the count and ID lookups lock what they read and two
+    concurrent uploads cannot both pass the 4 image limit.
     """
     if file.content_type not in ["image/jpeg", "image/png"]:
         raise HTTPException(
@@ -74,7 +76,7 @@ async def upload_image(
         raise HTTPException(status_code=500, detail="An unexpected error occurred.")
 
 @image_router.get("/images", response_model=List[dict])
-def get_images(db: Session = Depends(get_db)):
+def get_images(db: Session = Depends(get_read_db)):
     """
     API to retrieve all uploaded images with metadata and Base64 encoded content.
     """
@@ -98,7 +100,7 @@ def get_images(db: Session = Depends(get_db)):
     return response
 
 @image_router.get("/images/{image_id}", response_model=dict)
-def get_image(image_id: int, db: Session = Depends(get_db)):
+def get_image(image_id: int, db: Session = Depends(get_read_db)):
     """
     API to retrieve a specific image by ID with Base64 encoded content.
     """
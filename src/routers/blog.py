@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
-from src.db import get_db
+from src.db import get_db, get_read_db
+from src.batch import parse_id_list
 from src.models.blog import Blog
-from src.schemas.blog import BlogCreate, BlogResponse
+from src.schemas.blog import BlogCreate, BlogResponse, BlogBatchResponse
 
 blog_router = APIRouter()
 
@@ -28,7 +29,7 @@ def find_lowest_available_id(db: Session) -> int:
     return len(existing_ids) + 1
 
 @blog_router.get("/", response_model=list[BlogResponse])
-def read_blogs(db: Session = Depends(get_db)):
+def read_blogs(db: Session = Depends(get_read_db)):
     """
     Retrieve all blogs from the database.
     """
@@ -40,8 +41,26 @@ def read_blogs(db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="No blogs found.")
     return blogs
 
+@blog_router.get("/batch", response_model=BlogBatchResponse)
+def read_blogs_by_ids(ids: str = Query(..., min_length=1), db: Session = Depends(get_read_db)):
+    """
+    Retrieve several blogs by their IDs in a single query.
+    Blogs are returned in the requested order and unknown IDs are listed in missing_ids.
+    """
+    blog_ids = parse_id_list(ids)
+    try:
+        blogs = db.query(Blog).filter(Blog.id.in_(blog_ids)).all()
+    except SQLAlchemyError:
+        raise HTTPException(status_code=500, detail="Database error occurred.")
+
+    blogs_by_id = {blog.id: blog for blog in blogs}
+    return {
+        "blogs": [blogs_by_id[blog_id] for blog_id in blog_ids if blog_id in blogs_by_id],
+        "missing_ids": [blog_id for blog_id in blog_ids if blog_id not in blogs_by_id],
+    }
+
 @blog_router.get("/{blog_id}", response_model=BlogResponse)
-def read_blog(blog_id: int, db: Session = Depends(get_db)):
+def read_blog(blog_id: int, db: Session = Depends(get_read_db)):
     """
     Retrieve a specific blog by ID.
     """
@@ -72,42 +91,33 @@ def create_new_blog(blog: BlogCreate, db: Session = Depends(get_db)):
 @blog_router.put("/{blog_id}", response_model=BlogResponse)
 def update_existing_blog(blog_id: int, updated_blog: BlogCreate, db: Session = Depends(get_db)):
     """
-    Update an existing blog by ID.
+    Update an existing blog by ID with a single UPDATE statement.
+    The response is built from the payload, so the row is not read back.
     """
+    values = updated_blog.model_dump()
     try:
-        blog = db.query(Blog).filter(Blog.id == blog_id).first()
-    except SQLAlchemyError:
-        raise HTTPException(status_code=500, detail="Database error occurred while fetching the blog.")
-    if not blog:
-        raise HTTPException(status_code=404, detail="Blog not found.")
-
-    try:
-        blog.title = updated_blog.title
-        blog.content = updated_blog.content
-        blog.author = updated_blog.author
+        updated = db.query(Blog).filter(Blog.id == blog_id).update(values, synchronize_session=False)
         db.commit()
-        db.refresh(blog)
-        return blog
     except SQLAlchemyError:
         db.rollback()
         raise HTTPException(status_code=500, detail="Database error occurred while updating the blog.")
 
+    if not updated:
+        raise HTTPException(status_code=404, detail="Blog not found.")
+    return {"id": blog_id, **values}
+
 @blog_router.delete("/{blog_id}")
 def delete_existing_blog(blog_id: int, db: Session = Depends(get_db)):
     """
-    Delete a blog entry by ID.
+    Delete a blog entry by ID with a single DELETE statement.
     """
     try:
-        blog = db.query(Blog).filter(Blog.id == blog_id).first()
-    except SQLAlchemyError:
-        raise HTTPException(status_code=500, detail="Database error occurred while fetching the blog.")
-    if not blog:
-        raise HTTPException(status_code=404, detail="Blog not found.")
-
-    try:
-        db.delete(blog)
+        deleted = db.query(Blog).filter(Blog.id == blog_id).delete(synchronize_session=False)
         db.commit()
-        return {"message": "Blog deleted successfully."}
     except SQLAlchemyError:
         db.rollback()
         raise HTTPException(status_code=500, detail="Database error occurred while deleting the blog.")
+
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Blog not found.")
+    return {"message": "Blog deleted successfully."}
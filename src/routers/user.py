@@ -1,14 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
-from src.db import get_db
+from src.db import get_db, get_read_db
+from src.batch import parse_id_list
 from src.models.user import User
 from src.schemas.user import CreateUser, UpdateUser
 
 user_router = APIRouter()
 
 @user_router.get("/get_all_users")
-def get_all_users(db: Session = Depends(get_db)):
+def get_all_users(db: Session = Depends(get_read_db)):
     """
     Fetch all users from the database.
     """
@@ -21,7 +22,7 @@ def get_all_users(db: Session = Depends(get_db)):
     return users
 
 @user_router.get("/get_user_by_id/{id}")
-def get_user_by_id(id: int, db: Session = Depends(get_db)):
+def get_user_by_id(id: int, db: Session = Depends(get_read_db)):
     """
     Fetch a single user by their ID.
     """
@@ -33,6 +34,24 @@ def get_user_by_id(id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="User not found.")
     return user
 
+@user_router.get("/batch")
+def get_users_by_ids(ids: str = Query(..., min_length=1), db: Session = Depends(get_read_db)):
+    """
+    Fetch several users by their IDs in a single query.
+    Users are returned in the requested order and unknown IDs are listed in missing_ids.
+    """
+    user_ids = parse_id_list(ids)
+    try:
+        users = db.query(User).filter(User.id.in_(user_ids)).all()
+    except SQLAlchemyError:
+        raise HTTPException(status_code=500, detail="Database error occurred while fetching the users.")
+
+    users_by_id = {user.id: user for user in users}
+    return {
+        "users": [users_by_id[user_id] for user_id in user_ids if user_id in users_by_id],
+        "missing_ids": [user_id for user_id in user_ids if user_id not in users_by_id],
+    }
+
 @user_router.post("/create_user")
 def create_user(payload: CreateUser, db: Session = Depends(get_db)):
     """
@@ -51,55 +70,31 @@ def create_user(payload: CreateUser, db: Session = Depends(get_db)):
 @user_router.put("/update_user_by_id/{id}")
 def update_user_by_id(id: int, payload: UpdateUser, db: Session = Depends(get_db)):
     """
-    Update an existing user by their ID.
+    Update an existing user by their ID with a single UPDATE statement.
     """
     try:
-        user_instance = db.query(User).filter(User.id == id).first()
-    except SQLAlchemyError:
-        db.rollback()
-        raise HTTPException(status_code=500, detail="Database error occurred while updating the user.")
-    
-    if not user_instance:
-            raise HTTPException(status_code=404, detail="User not found.")
-    
-    try:
-        user_instance.username = payload.username
-        user_instance.country_code = payload.country_code
-        user_instance.phone_number = payload.phone_number
-        user_instance.selected_site = payload.selected_site
-
+        updated = db.query(User).filter(User.id == id).update(payload.model_dump(), synchronize_session=False)
         db.commit()
-        db.refresh(user_instance)
-        return {"id": user_instance.id, "message": "User data updated successfully", "status": 200}
     except SQLAlchemyError:
         db.rollback()
         raise HTTPException(status_code=500, detail="Database error occurred while updating the user.")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail="An unexpected error occurred.")
-    
-    
+
+    if not updated:
+        raise HTTPException(status_code=404, detail="User not found.")
+    return {"id": id, "message": "User data updated successfully", "status": 200}
 
 @user_router.delete("/delete_user_by_phone_number/{phone_number}")
 def delete_user_by_phone_number(phone_number: str, db: Session = Depends(get_db)):
     """
-    Delete a user by their phone number.
+    Delete a user by their phone number with a single DELETE statement.
     """
     try:
-        user = db.query(User).filter(User.phone_number == phone_number).first()
-    except SQLAlchemyError:
-        db.rollback()
-        raise HTTPException(status_code=500, detail="Database error occurred while deleting the user.")
-    
-    if not user:
-            raise HTTPException(status_code=404, detail="User not found.")
-    
-    try:
-        db.delete(user)
+        deleted = db.query(User).filter(User.phone_number == phone_number).delete(synchronize_session=False)
         db.commit()
-        return {"message": "User deleted successfully", "status": 200}
     except SQLAlchemyError:
         db.rollback()
         raise HTTPException(status_code=500, detail="Database error occurred while deleting the user.")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail="An unexpected error occurred.")
-    
+
+    if not deleted:
+        raise HTTPException(status_code=404, detail="User not found.")
+    return {"message": "User deleted successfully", "status": 200}
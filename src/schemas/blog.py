@@ -13,3 +13,7 @@ class BlogResponse(BlogBase):
 
     class Config:
         from_attributes = True
+
+class BlogBatchResponse(BaseModel):
+    blogs: list[BlogResponse]
+    missing_ids: list[int]